@@ -4,14 +4,232 @@
 import time
 import sys
 
+# Imported under private names, as this module is star-imported into the
+# BinPy namespace.
+from array import array as _array
+import bisect as _bisect
+import heapq as _heapq
+import itertools as _itertools
+import numbers as _numbers
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+try:
+    from numba import njit as _njit
+except ImportError:
+    def _njit(*args, **kwargs):
+        """ numba is optional. Without it the kernel runs as plain Python. """
+        return lambda function: function
+
+
+# Number of output samples computed over one period of the waveform.
+_SAMPLES_PER_PERIOD = 500
+
+# Target time between two updates of the output ( in s ). When the sampling
+# interval is shorter than this ( above 20 Hz ) several samples are advanced
+# per update instead of sleeping for each one of them.
+_WAKE_INTERVAL = 1e-4
+
+# Monotonic high resolution clock. time.perf_counter is not available on
+# Python 2.
+_clock = getattr(time, 'perf_counter', time.time)
+
+# Coefficients of the odd polynomial approximating sin(pi / 2 * x) over
+# [ -1, 1 ] ( Mendenhall's normalized sincos approximation ).
+_SIN_C1 = 1.5707963235
+_SIN_C3 = -0.645963615
+_SIN_C5 = 0.0796819754
+_SIN_C7 = -0.0046075748
+
+_INV_TWO_PI = 1 / (2 * math.pi)
+
+
+def _fast_sin(x):
+    """
+    Approximate math.sin(x) by reducing x to a quarter period and
+    evaluating a polynomial. The absolute error is below 1e-4.
+    """
+    # Fraction of a period in [ -0.5, 0.5 ]
+    q = x * _INV_TWO_PI
+    q -= int(q)
+    if q > 0.5:
+        q -= 1.0
+    elif q < -0.5:
+        q += 1.0
+
+    # Quarter periods, folded into [ -1, 1 ] using sin(x) = sin(pi - x)
+    q *= 4.0
+    if q > 1.0:
+        q = 2.0 - q
+    elif q < -1.0:
+        q = -2.0 - q
+
+    q2 = q * q
+    return q * (_SIN_C1 + q2 * (_SIN_C3 + q2 * (_SIN_C5 + q2 * _SIN_C7)))
+
+
+def _fast_sin_np(x):
+    """
+    numpy version of _fast_sin, evaluated over a whole array with
+    element-wise operations only.
+    """
+    # Quarter periods in [ -2, 2 ]
+    q = x * _INV_TWO_PI
+    q = 4.0 * (q - _np.round(q))
+
+    # Fold into [ -1, 1 ] using sin(x) = sin(pi - x), without branching
+    q = 2.0 * _np.clip(q, -1.0, 1.0) - q
+
+    q2 = q * q
+    return q * (_SIN_C1 + q2 * (_SIN_C3 + q2 * (_SIN_C5 + q2 * _SIN_C7)))
+
+
+# Normalized waveform generators. Each maps the phase ( fraction of the
+# period elapsed, in [ 0, 1 ) ) to an output level in [ 0, 1 ] using a
+# single arithmetic expression, without branching on the phase.
+
+def _sine(p):
+    return 0.5 * _fast_sin(2 * 3.145926 * p) + 0.5
+
+
+def _square(p):
+    return (p < 0.5) * 1.0
+
+
+def _ramp(p):
+    return p
+
+
+def _triangular(p):
+    return 1 - abs(2 * p - 1)
+
+
+# Indexed by the waveform type number. TTL shares the square generator and
+# only differs in the output level.
+_WAVE_FUNCTIONS = (_sine, _square, _ramp, _triangular, _square)
+
+
+def _compute_voltage(sample, mod_type, m_t, ampl, offset, ttl):
+    """
+    Scale the normalized waveform sample to the output voltage, applying
+    amplitude modulation when mod_type is SignalGenerator.AM_MOD. The
+    sample ( and m_t ) may also be numpy arrays.
+    """
+    if mod_type == 1:
+        sample = (1 + m_t) * (sample * ampl + offset) / ampl
+
+    if ttl:
+        return sample * 5.0  # TTL amplitude is constant at 5v
+
+    return sample * ampl
+
+
+# Compiled version of _compute_voltage for the arrays of generate(). The
+# scalar updates use the plain Python version, which is cheaper than a call
+# through the numba dispatcher.
+_compute_voltage_batch = _njit(cache=True, fastmath=True)(_compute_voltage)
+
+
+class _SchedulerThread(threading.Thread):
+
+    """
+    A single daemon thread updating the outputs of all the SignalGenerator
+    objects, instead of one thread per object. The update iterators of the
+    generators are kept in a heap ordered by the time of their next update.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.daemon = True
+
+        # Entries are ( next_update_time, registration_no, update_iterator )
+        self._heap = []
+        self._count = _itertools.count()
+        self._wakeup = threading.Condition()
+
+    @classmethod
+    def register(cls, updates):
+        """
+        Schedule the update iterator of a SignalGenerator object, starting
+        the scheduler thread on the first call.
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                cls._instance.start()
+            scheduler = cls._instance
+
+        with scheduler._wakeup:
+            _heapq.heappush(
+                scheduler._heap,
+                (_clock(), next(scheduler._count), updates))
+            scheduler._wakeup.notify()
+
+    @classmethod
+    def unregister(cls, updates):
+        """
+        Remove a registered update iterator from the schedule. An update
+        already in progress is not interrupted; the iterator stops on its
+        own once its SignalGenerator is killed.
+        """
+        scheduler = cls._instance
+        with scheduler._wakeup:
+            scheduler._heap[:] = [
+                entry for entry in scheduler._heap if entry[2] is not updates]
+            _heapq.heapify(scheduler._heap)
+            scheduler._wakeup.notify()
+
+    def run(self):
+        heap = self._heap
+        wakeup = self._wakeup
 
-class SignalGenerator(threading.Thread):
+        while True:
+            with wakeup:
+                while True:
+                    if not heap:
+                        wakeup.wait()
+                        continue
+
+                    now = _clock()
+                    if heap[0][0] > now:
+                        # Sleep until the earliest update is due or a new
+                        # generator is registered.
+                        wakeup.wait(heap[0][0] - now)
+                        continue
+
+                    next_time, count, updates = _heapq.heappop(heap)
+                    break
+
+            # The update runs without holding the lock, so that register()
+            # never waits on it.
+            try:
+                step = next(updates)
+
+            except StopIteration:
+                # The generator was killed or has an invalid setting
+                continue
+
+            with wakeup:
+                # A generator that fell behind is not updated in a burst,
+                # its phase follows the clock anyway.
+                _heapq.heappush(
+                    heap, (max(next_time + step, now), count, updates))
+
+
+class SignalGenerator(object):
 
     """
     Signal Generator Block
     ======================
 
-    Create a SignalGenerator object ( runs on a child thread ) used to generate
+    Create a SignalGenerator object ( updated by a thread shared by all the
+    SignalGenerator objects ) used to generate
     an analog voltage signal of the desired type. The frequency and amplitude
     parameters can be customized.
 
@@ -81,6 +299,10 @@ class SignalGenerator(threading.Thread):
 
     trigger()                        : Calculate and update the time varying output based on the current setting.
 
+    generate(n, sr, m_t=None)        : Compute n samples of the output at the sampling rate sr ( in Hz ) for the
+                                       current setting without using the thread, and return them as a numpy array.
+                                       m_t is an optional sequence of n modulating input samples.
+
 
     PROPERTIES
     ==========
@@ -93,7 +315,11 @@ class SignalGenerator(threading.Thread):
     amplitude                        : Current amplitude level
     enabled                          : Returns true if the enable input is HIGH
     disabled                         : Returns true if the enable input is LOW
-    sampling_time_interval           : Returns the updation time interval of the output
+    sampling_time_interval           : Returns the time interval between two samples of the output
+                                       waveform ( time_period / 500 )
+    update_interval                  : Returns the time interval between two updates of the output. Above
+                                       20 Hz several samples are advanced per update, so this is a multiple
+                                       of sampling_time_interval.
     last_updated_time                : Returns a floating point value corresponding
                                        to the last updated time
     updating                         : Returns true if the updation is not yet over
@@ -152,11 +378,11 @@ class SignalGenerator(threading.Thread):
     >>> c_t.set_modulation_input(m_t.outputs)
     >>> c_t.set_modulation_type(1)
     >>> time.sleep(0.5) # To allow setup time
-    >>> data = np.zeros(shape = (2, math.ceil(m_t.time_period / c_t.sampling_time_interval)))
+    >>> data = np.zeros(shape = (2, math.ceil(m_t.time_period / c_t.update_interval)))
     >>> for i in range(data.shape[1]):
     ... data[0][i] = m_t.last_updated_time + m_t.time_period * i
     ... data[1][i] = c_t.outputs[0].voltage
-    ... time.sleep(c_t.sampling_time_interval)
+    ... time.sleep(c_t.update_interval)
     >>> fig, ax = plt.subplots()
     >>> ax.plot(data[0], data[1])
     >>> plt.show()
@@ -170,7 +396,7 @@ class SignalGenerator(threading.Thread):
     AMPL_MIN = 0.0
     AMPL_MAX = 10.0
     FREQ_MIN = 0.1
-    FREQ_MAX = 1000000000
+    FREQ_MAX = 1000000000.0
 
     NO_MOD = 0
     AM_MOD = 1
@@ -193,12 +419,14 @@ class SignalGenerator(threading.Thread):
         7: (10000000, 1000000000)
     }
 
+    # FREQ_RANGE tuples in ascending order and their upper limits, used by
+    # set_frequency_exact to look up the range of a frequency with bisect.
+    _FREQ_TUPLES = sorted(FREQ_RANGE.values())
+    _FREQ_UPPER = [hi for lo, hi in _FREQ_TUPLES]
+
     ATTEN_LEVEL = {0: 0, 1: 10, 2: 20, 3: 30, 4: 40}
 
     def __init__(self, typ=0, freq=1000, ampl=5):
-        threading.Thread.__init__(self)
-        self.daemon = True
-
         self.enable = Bus(1)
 
         self.outputs = Bus(2)
@@ -221,35 +449,39 @@ def __init__(self, typ=0, freq=1000, ampl=5):
         # This will calculate the ampl range / amplitude percent ( equiv. to
         # amplitude knob ) and update them accordingly
 
-        self._last_updated_time = 0
+        self._last_updated_time = 0.0
 
+        # Set by kill() to stop an update in progress from being scheduled
+        # again.
         self._exit = False
-        # Auto start the thread
-        self.start()
+
+        # Auto start the updates
+        self._update_iter = self._updates()
+        _SchedulerThread.register(self._update_iter)
 
     @property
     def frequency(self):
-        return float(self._frequency)
+        return self._frequency
 
     @property
     def time_period(self):
-        return float(self._time_period)
+        return self._time_period
 
     @property
     def attenuation(self):
-        return float(self._attenuation)
+        return self._attenuation
 
     @property
     def amplitude(self):
-        return float(self._amplitude)
+        return self._amplitude
 
     @property
     def offset(self):
-        return float(self._offset)
+        return self._offset
 
     @property
     def type(self):
-        return float(self._type)
+        return self._type
 
     @property
     def enabled(self):
@@ -267,6 +499,10 @@ def frequency_range(self):
     def sampling_time_interval(self):
         return self._sampling_time_interval
 
+    @property
+    def update_interval(self):
+        return self._batch * self._sampling_time_interval
+
     @property
     def last_updated_time(self):
         return self._last_updated_time
@@ -277,34 +513,38 @@ def updating(self):
 
     def set_amplitude_exact(self, ampl):
         """ Set the amplitude of the output signal """
-        if (type(ampl) not in [int, float]):
+        if not isinstance(ampl, (int, float)):
             raise Exception(
                 "ERROR: Amplitude can only be a float ( or int ) value.")
 
         if ampl <= self.AMPL_MIN:
-            self._amplitude = 0
-            self._attenuation = 0
+            self._amplitude = 0.0
+            self._attenuation = 0.0
 
         if ampl >= self.AMPL_MAX:
-            self._amplitude = 10  # 10v is the maximum amplitude
-            self._attenuation = 0
+            self._amplitude = 10.0  # 10v is the maximum amplitude
+            self._attenuation = 0.0
 
         self._attenuation = 20 * (math.log10(float(ampl) / 10))
+        self._atten_gain = 10.0 ** (-self._attenuation / 20.0)
         self._amplitude = float(ampl)
+        self._dirty = True
 
     def set_attenuation(self, attenuation):
         """
         Set the attenuation value. Use float values for input or use predefined
         dictionary SignalGenerator.ATTEN_LEVEL
         """
-        if (type(attenuation) not in [int, float]):
+        if not isinstance(attenuation, (int, float)):
             raise Exception(
                 "ERROR: Attenuation can only be a float ( or int ) value.")
 
         if (attenuation < 0):
             raise Exception("ERROR: Only positive values can be given")
 
-        self._attenuation = attenuation
+        self._attenuation = float(attenuation)
+        # Linear gain for the attenuation, used by set_amplitude
+        self._atten_gain = 10.0 ** (-self._attenuation / 20.0)
 
     def set_amplitude(self, percent_range):
         """
@@ -312,7 +552,7 @@ def set_amplitude(self, percent_range):
         The current range is decided by the current attenuation value.
         Set appropriate attenuation value before setting the amplitude.
         """
-        if (type(percent_range) not in [int, float]):
+        if not isinstance(percent_range, (int, float)):
             raise Exception("ERROR: Only int or float values can be passed.")
 
         if (percent_range < 0 or percent_range > 100):
@@ -320,12 +560,9 @@ def set_amplitude(self, percent_range):
                 "ERROR: Only values between 1 to 100 can be passed")
 
         self._amplitude = float(self.AMPL_MIN +
-                                (((10 ** (-
-                                          self._attenuation /
-                                          20)) *
-                                  self.AMPL_MAX) *
-                                 percent_range *
-                                 0.01))
+                                self._atten_gain * self.AMPL_MAX *
+                                percent_range * 0.01)
+        self._dirty = True
 
     def set_frequency_range(self, range_tuple):
         """
@@ -347,7 +584,7 @@ def set_frequency_range(self, range_tuple):
                        }
         """
 
-        if (type(range_tuple) not in [list, tuple]):
+        if not isinstance(range_tuple, (list, tuple)):
             raise TypeError(
                 "ERROR: Invalid input. Input can be specified only as a list or a tuple")
 
@@ -372,7 +609,7 @@ def set_frequency(self, percent_range):
         Set the frequency as the percentage value of the current range. - Knob like usage.
         Set appropriate range before setting the frequency.
         """
-        if (type(percent_range) not in [int, float]):
+        if not isinstance(percent_range, (int, float)):
             raise TypeError("ERROR: Only int or float values can be passed.")
 
         if (percent_range < 0 or percent_range > 100):
@@ -387,30 +624,31 @@ def set_frequency(self, percent_range):
         else:
             self._time_period = float("inf")
 
-        self._sampling_time_interval = self._time_period / 500.0
+        self._sampling_time_interval = self._time_period / _SAMPLES_PER_PERIOD
+        self._batch = max(
+            1, int(_WAKE_INTERVAL / self._sampling_time_interval))
+        self._dirty = True
 
     def set_frequency_exact(self, frequency):
         """
         Set the given frequency as the freqency of the output. The current range will be varied based on the value.
         """
-        if (type(frequency) not in [int, float]):
+        if not isinstance(frequency, (int, float)):
             raise TypeError(
                 "ERROR: Invalid Input type. Frequency can only be a float value")
 
         if (frequency < self.FREQ_MIN):
-            self._frequency = self.FREQ_MIN
+            frequency = self.FREQ_MIN
 
         if (frequency > self.FREQ_MAX):
-            self._frequency = self.FREQ_MAX
+            frequency = self.FREQ_MAX
 
         self._frequency = float(frequency)
 
         # Choose the appropriate frequency range based on the passed value.
-        for i in range(len(self.FREQ_RANGE)):
-            if (frequency <= self.FREQ_RANGE[i][
-                    0] and frequency >= self.FREQ_RANGE[i][0]):
-                self._frequency_range = self.FREQ_RANGE[i]
-                break
+        i = _bisect.bisect_left(self._FREQ_UPPER, frequency)
+        self._frequency_range = self._FREQ_TUPLES[
+            min(i, len(self._FREQ_TUPLES) - 1)]
 
         if self._frequency != 0:
             self._time_period = float(1) / self._frequency
@@ -418,9 +656,12 @@ def set_frequency_exact(self, frequency):
         else:
             self._time_period = float("inf")
 
-        self._sampling_time_interval = self._time_period / 500.0
+        self._sampling_time_interval = self._time_period / _SAMPLES_PER_PERIOD
         # Much greater than the nyquist rate for an accurate output with the
         # least deviation.
+        self._batch = max(
+            1, int(_WAKE_INTERVAL / self._sampling_time_interval))
+        self._dirty = True
 
     def set_type(self, typ):
         """
@@ -440,19 +681,33 @@ def set_type(self, typ):
         """
         if typ in range(5):
             self._type = typ
+            self._wave_fn = _WAVE_FUNCTIONS[typ]
+            self._rebuild_wave()
+            self._dirty = True
 
         else:
             raise ValueError(
                 "ERROR: Invalid input. Please give a numerical value "
                 "between 0 and 4 ( both inclusive ) ")
 
+    def _rebuild_wave(self):
+        """
+        Precompute one period of the normalized output waveform ( in the range
+        [ 0, 1 ] ) for the current type. The updates index into this table
+        instead of evaluating the waveform every time.
+        """
+        wave_fn = self._wave_fn
+        self._wave_buf = _array(
+            'd', [wave_fn(i / float(_SAMPLES_PER_PERIOD))
+                  for i in range(_SAMPLES_PER_PERIOD)])
+
     def set_offset(self, offset):
         """
         Set a DC offset voltage for the output waveform
         Range of the acceptable offset value is
         [ -SignalGenerator.AMPL_MAX, SignalGenerator.AMPL_MIN ]
         """
-        if type(offset) not in [float, int]:
+        if not isinstance(offset, (int, float)):
             raise TypeError(
                 "ERROR: Offset can be a float (or int value) within "
                 "the specified range only.")
@@ -462,6 +717,7 @@ def set_offset(self, offset):
                 "ERROR: Invalid offset value. Specify offset within the range")
 
         self._offset = float(offset)
+        self._dirty = True
 
     def set_enable(self, enable):
         """
@@ -506,6 +762,7 @@ def set_modulation_type(self, mod_type):
                 "ERROR: Invalid input for modulation type. Allowed values are 0, 1 or 2")
 
         self._mod_type = mod_type
+        self._dirty = True
 
     def set_modulation_input(self, mod_input):
         """
@@ -524,82 +781,141 @@ def set_modulation_input(self, mod_input):
                 mod_input,
                 self.mod_ip)
 
-    def run(self):
+    def _updates(self):
         """
-        The main run module which periodically updates the output.
+        Iterator updating the output once per iteration and yielding the time
+        ( in s ) until the next update is due. It is driven by the shared
+        _SchedulerThread and stops when the SignalGenerator is killed.
         """
 
         try:
+            # The settings are cached in locals and only reloaded after a
+            # setter has flagged them as modified ( self._dirty ).
+            compute = _compute_voltage
+            out_h, out_l = self.outputs[0], self.outputs[1]
+            mod_h, mod_l = self.mod_ip[0], self.mod_ip[1]
+
+            # Normalized phase of the output ( fraction of the period ) in
+            # [ 0, 1 )
+            phase = 0.0
+            last_time = _clock()
+
             while not self._exit:
                 # Update the time varying value of the output.
 
-                # The current time offset
-                cur_time_offset = time.time() % self._time_period
+                if self._dirty:
+                    self._dirty = False
+                    wave_buf = self._wave_buf
+                    ttl = (self._type == self.TTL)
+                    mod_type = self._mod_type
+                    frequency = self._frequency
+                    period = self._time_period
+                    # Samples advanced per update, only the last of which
+                    # is written to the output.
+                    step = self.update_interval
+                    if not (0.0 < step < float("inf")):
+                        # The scheduler could never advance past such an
+                        # update, stop updating instead.
+                        return
+                    ampl = self._amplitude
+                    offset = self._offset
+                    out_l.voltage = -offset
 
                 self._updating = True
 
-                # If modulation is selected as FM
-                if (self._mod_type == 2):
-                    # Getting the modulating input
-                    m_t = self.mod_ip[0].voltage - self.mod_ip[1].voltage
+                # Getting the modulating input, only when modulation is
+                # selected.
+                m_t = (mod_h.voltage - mod_l.voltage) if mod_type else 0.0
 
-                    freq = self._frequency + m_t
-                    if freq != 0:
-                        time_p = 1 / freq
+                # Advance the phase by the time elapsed since the previous
+                # update, which may be longer than the requested step. If
+                # modulation is selected as FM the phase advances at the
+                # instantaneous frequency.
+                now = _clock()
+                if (mod_type == 2):
+                    phase += (now - last_time) * (frequency + m_t)
 
-                    else:
-                        time_p = float("inf")
-
-                else:
-                    freq = self._frequency
-                    time_p = self._time_period
-
-                # If sine wave
-                if (self.type == 0):
-                    self._last_updated_time = cur_time_offset
-                    voltage = 0.5 * math.sin(
-                        2 * 3.145926 * freq * cur_time_offset) + 0.5
-
-                # If square wave
-                elif (self.type == 1 or self.type == 4):
-                    self._last_updated_time = cur_time_offset
-                    voltage = 1 if (
-                        (cur_time_offset) < time_p /
-                        float(2)) else 0
-
-                # If Ramp
-                elif (self.type == 2):
-                    self._last_updated_time = cur_time_offset
-                    voltage = cur_time_offset / time_p
-
-                # If triangular
                 else:
-                    self._last_updated_time = cur_time_offset
-                    voltage = 2 * cur_time_offset / time_p if (
-                        (cur_time_offset) < time_p /
-                        float(2)) else (2 * (time_p - cur_time_offset) / time_p)
+                    phase += (now - last_time) * frequency
+                last_time = now
 
-                if (self._mod_type == 1):
-                    m_t = self.mod_ip[0].voltage - self.mod_ip[1].voltage
-                    c_t = voltage * self._amplitude + self.offset
-                    voltage = (1 + m_t) * c_t
-                    voltage /= self._amplitude
+                if not (0.0 <= phase < 1.0):
+                    phase %= 1.0
 
-                if (self.type != 4):
-                    voltage *= self._amplitude
+                # Index of the current sample within one period of the
+                # precomputed waveform.
+                idx = int(phase * _SAMPLES_PER_PERIOD) % _SAMPLES_PER_PERIOD
 
-                else:
-                    voltage *= 5.0  # TTL amplitude is constant at 5v
+                self._last_updated_time = idx * period / _SAMPLES_PER_PERIOD
 
-                self.outputs[0].voltage = voltage
-                self.outputs[1].voltage = -self.offset
+                out_h.voltage = compute(
+                    wave_buf[idx], mod_type, m_t, ampl, offset, ttl)
 
                 self._updating = False
-                time.sleep(self._sampling_time_interval)
+                yield step
 
         except Exception as e:
             return
 
+    def generate(self, n, sr, m_t=None):
+        """
+        Compute n samples of the output voltage ( outputs[0] - outputs[1] ),
+        starting at phase 0 and sampled at sr Hz, for the current setting.
+        The samples are computed with numpy as a batch, without using the
+        thread. m_t is an optional sequence of n modulating input samples,
+        used when AM or FM modulation is selected.
+        """
+        if _np is None:
+            raise ImportError(
+                "ERROR: numpy is required to generate a batch of samples.")
+
+        # Any integer type ( long, numpy integers ) but bool is accepted.
+        if (not isinstance(n, _numbers.Integral) or isinstance(n, bool) or
+                n < 0):
+            raise ValueError(
+                "ERROR: The number of samples must be a non negative int.")
+
+        if not isinstance(sr, _numbers.Real) or not sr > 0:
+            raise ValueError(
+                "ERROR: The sampling rate must be a positive float ( or "
+                "int ) value.")
+
+        t = _np.arange(n) / float(sr)
+
+        if m_t is None:
+            m_t = 0.0
+            cycles = self._frequency * t
+
+        else:
+            m_t = _np.asarray(m_t, dtype=float)
+            if m_t.shape != (n,):
+                raise ValueError(
+                    "ERROR: The modulating input must contain n samples.")
+
+            if self._mod_type == self.FM_MOD:
+                # The phase advances at the instantaneous frequency. The
+                # modulation accumulated by a sample excludes its own value,
+                # so that the phase starts at 0 like the carrier's.
+                m_phase = _np.concatenate(([0.0], _np.cumsum(m_t[:-1])))
+                cycles = self._frequency * t + m_phase / float(sr)
+            else:
+                cycles = self._frequency * t
+
+        phase = cycles % 1.0
+
+        if self._type == self.SIN:
+            wave = 0.5 * _fast_sin_np(2 * 3.145926 * phase) + 0.5
+
+        else:
+            # The other waveform generators are plain arithmetic and accept
+            # arrays as they are.
+            wave = self._wave_fn(phase)
+
+        return _compute_voltage_batch(
+            wave, self._mod_type, m_t, self._amplitude, self._offset,
+            self._type == self.TTL) + self._offset
+
     def kill(self):
-        """ To terminate this thread """
+        """ To stop updating the output """
         self._exit = True
+        _SchedulerThread.unregister(self._update_iter)
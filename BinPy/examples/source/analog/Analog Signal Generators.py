@@ -59,12 +59,12 @@
         2,
         math.ceil(
             m_t.time_period /
-            c_t.sampling_time_interval)))
+            c_t.update_interval)))
 
 for i in range(data.shape[1]):
     data[0][i] = m_t.last_updated_time + m_t.time_period * i
     data[1][i] = c_t.outputs[0].voltage
-    time.sleep(c_t.sampling_time_interval)
+    time.sleep(c_t.update_interval)
 
 # Plot the modulated signal for the given timeframe
 fig, ax = plt.subplots()
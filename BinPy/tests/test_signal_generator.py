@@ -1,6 +1,8 @@
 import time
 import math
+from unittest import SkipTest
 from BinPy import *
+from BinPy.analog import sig_gen
 
 
 def test_sin_signal():
@@ -24,7 +26,7 @@ def test_sin_signal():
             sig1.kill()
             assert False
 
-        time.sleep(sig1.sampling_time_interval)
+        time.sleep(sig1.update_interval)
 
     sig1.kill()
 
@@ -53,7 +55,7 @@ def test_square_signal():
             sig1.kill()
             assert False
 
-        time.sleep(sig1.sampling_time_interval)
+        time.sleep(sig1.update_interval)
 
     sig1.kill()
 
@@ -81,7 +83,7 @@ def test_ramp_signal():
             sig1.kill()
             assert False
 
-        time.sleep(sig1.sampling_time_interval)
+        time.sleep(sig1.update_interval)
 
     sig1.kill()
 
@@ -111,7 +113,7 @@ def test_triangle_signal():
             sig1.kill()
             assert False
 
-        time.sleep(sig1.sampling_time_interval)
+        time.sleep(sig1.update_interval)
 
     sig1.kill()
 
@@ -137,6 +139,149 @@ def test_ttl_signal():
             sig1.kill()
             assert False
 
-        time.sleep(sig1.sampling_time_interval)
+        time.sleep(sig1.update_interval)
+
+    sig1.kill()
+
+
+def test_frequency_range():
+    sig1 = SignalGenerator(typ=0, freq=5000, ampl=1)
+
+    if sig1.frequency_range != SignalGenerator.FREQ_RANGE[3]:
+        sig1.kill()
+        assert False
+
+    sig1.set_frequency_exact(0.5)
+    if sig1.frequency_range != SignalGenerator.FREQ_RANGE[0]:
+        sig1.kill()
+        assert False
+
+    sig1.set_frequency_exact(100)
+    if sig1.frequency_range != SignalGenerator.FREQ_RANGE[1]:
+        sig1.kill()
+        assert False
+
+    sig1.set_frequency_exact(500000000)
+    if sig1.frequency_range != SignalGenerator.FREQ_RANGE[7]:
+        sig1.kill()
+        assert False
+
+    sig1.kill()
+
+
+def test_generate():
+    try:
+        import numpy as np
+    except ImportError:
+        raise SkipTest("numpy is not installed")
+
+    sig1 = SignalGenerator(typ=2, freq=1000, ampl=2)
+    sig1.set_offset(-1)
+    sig1.kill()
+    # To make range [ -1 to 1 ]
+
+    samples = sig1.generate(500, 500000)
+    r_t = 2 * ((np.arange(500) / 500.0) - 0.5)
+    assert np.allclose(samples, r_t)
+
+    sig1.set_offset(0)
+    sig1.set_amplitude_exact(1)
+    sig1.set_type(0)
+
+    samples = sig1.generate(500, 500000)
+    sin_t = 0.5 * np.sin(2 * 3.145926 * (np.arange(500) / 500.0)) + 0.5
+    assert np.allclose(samples, sin_t, atol=1e-3)
+
+    # numpy integers are accepted as the number of samples, bool is not
+    samples = sig1.generate(np.int64(500), np.int64(500000))
+    assert np.allclose(samples, sin_t, atol=1e-3)
+
+    try:
+        sig1.generate(True, 500000)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_generate_modulation():
+    try:
+        import numpy as np
+    except ImportError:
+        raise SkipTest("numpy is not installed")
+
+    phase = np.arange(500) / 500.0
+
+    # TTL output is 5v irrespective of the amplitude
+    sig1 = SignalGenerator(typ=4, freq=1000, ampl=2)
+    sig1.kill()
+
+    samples = sig1.generate(500, 500000)
+    ttl_t = np.where(phase < 0.5, 5.0, 0.0)
+    assert np.allclose(samples, ttl_t)
+
+    # AM of a sine carrier in the range [ -1 to 1 ] with m_t = 0.5
+    sig1.set_type(0)
+    sig1.set_offset(-1)
+    sig1.set_modulation_type(1)
+
+    samples = sig1.generate(500, 500000, np.ones(500) * 0.5)
+    c_t = 2 * (0.5 * np.sin(2 * 3.145926 * phase) + 0.5) - 1
+    am_t = 1.5 * c_t - 1
+    assert np.allclose(samples, am_t, atol=1e-3)
+
+    # FM of a 1 kHz ramp with a constant 1 kHz deviation gives a 2 kHz ramp
+    sig1.set_type(2)
+    sig1.set_offset(0)
+    sig1.set_amplitude_exact(1)
+    sig1.set_modulation_type(2)
+
+    samples = sig1.generate(500, 500000, np.ones(500) * 1000)
+    fm_t = (2 * phase) % 1.0
+    assert np.allclose(samples, fm_t)
+
+
+def test_phase_follows_clock():
+    # The generator is kept off the shared scheduler and driven here, on a
+    # fake clock, so that the result does not depend on OS scheduling.
+    clock = [100.0]
+    real_clock = sig_gen._clock
+    real_register = sig_gen._SchedulerThread.register
+    sig_gen._clock = lambda: clock[0]
+    sig_gen._SchedulerThread.register = classmethod(lambda cls, updates: None)
+
+    try:
+        sig1 = SignalGenerator(typ=2, freq=2, ampl=1)
+        updates = sig1._update_iter
+        next(updates)
+
+        # The ramp output is the phase of the signal. It must advance by the
+        # time elapsed since the previous update times the frequency,
+        # however long that was compared to the update interval.
+        phase = sig1.outputs[0].voltage
+        for dt in [0.125, 0.375, 1.0, 0.5, 2.625, 0.25]:
+            clock[0] += dt
+            next(updates)
+            phase = (phase + dt * sig1.frequency) % 1.0
+            assert sig1.outputs[0].voltage == phase
+
+        updates.close()
+
+    finally:
+        sig_gen._clock = real_clock
+        sig_gen._SchedulerThread.register = real_register
+
+
+def test_frequency_saturation():
+    sig1 = SignalGenerator(typ=0, freq=1000, ampl=1)
+
+    sig1.set_frequency_exact(-5)
+    if sig1.frequency != SignalGenerator.FREQ_MIN:
+        sig1.kill()
+        assert False
+
+    sig1.set_frequency_exact(2 * SignalGenerator.FREQ_MAX)
+    if sig1.frequency != SignalGenerator.FREQ_MAX:
+        sig1.kill()
+        assert False
 
     sig1.kill()